@@ -1,4 +1,13 @@
 from .lib import GoogleCalendar
 from .config import Config
+from .backends import CalendarBackend, GoogleApiBackend, InMemoryBackend
+from .encoding import ResultEncoder
 
-__all__ = ["GoogleCalendar", "Config"]
+__all__ = [
+    "GoogleCalendar",
+    "Config",
+    "CalendarBackend",
+    "GoogleApiBackend",
+    "InMemoryBackend",
+    "ResultEncoder",
+]
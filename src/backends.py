@@ -0,0 +1,542 @@
+import base64
+import bisect
+import copy
+import json
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+
+DEFAULT_MAX_RESULTS = 250
+
+
+class EventNotFoundError(LookupError):
+    """
+    Raised by a backend when the requested event does not exist.
+    """
+
+
+class CalendarNotFoundError(LookupError):
+    """
+    Raised by a backend when the requested calendar does not exist.
+    """
+
+
+class CalendarBackend(ABC):
+    """
+    Storage interface used by GoogleCalendar.
+
+    Every method mirrors the corresponding Calendar v3 ``events`` call and returns
+    the same resource shapes, so callers can swap implementations freely.
+    """
+
+    def fork(self) -> "CalendarBackend | None":
+        """
+        Returns a backend that can be used from another thread alongside this one.
+
+        Thread-safe backends return themselves. Backends that cannot provide an
+        independent connection return None.
+        """
+        return self
+
+    @abstractmethod
+    def list_calendars(self, page_token: str | None = None) -> dict[str, Any]:
+        """
+        Lists the calendars on the user's calendar list.
+
+        Args:
+            page_token: ``nextPageToken`` from a previous call (optional).
+
+        Returns:
+            A calendar list resource with ``items`` and, when more results exist,
+            ``nextPageToken``.
+        """
+
+    @abstractmethod
+    def get_calendar(self, calendar_id: str) -> dict[str, Any]:
+        """
+        Retrieves a calendar's metadata, whether or not it is on the calendar list.
+
+        Args:
+            calendar_id: The ID of the calendar.
+
+        Returns:
+            The calendar resource, including its ``timeZone``.
+
+        Raises:
+            CalendarNotFoundError: If the calendar does not exist.
+        """
+
+    @abstractmethod
+    def list_events(
+        self,
+        calendar_id: str,
+        time_min: str,
+        time_max: str,
+        page_token: str | None = None,
+        max_results: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Lists single events overlapping a time range, ordered by start time.
+
+        Args:
+            calendar_id: The calendar to read from.
+            time_min: RFC3339 lower bound (exclusive) on event end time.
+            time_max: RFC3339 upper bound (exclusive) on event start time.
+            page_token: ``nextPageToken`` from a previous call (optional).
+            max_results: Maximum number of events per page (optional).
+
+        Returns:
+            An events list resource with ``items`` and, when more results exist,
+            ``nextPageToken``.
+        """
+
+    @abstractmethod
+    def get_event(self, calendar_id: str, event_id: str) -> dict[str, Any]:
+        """
+        Retrieves a single event.
+
+        Args:
+            calendar_id: The calendar to read from.
+            event_id: The ID of the event.
+
+        Returns:
+            The event resource.
+
+        Raises:
+            EventNotFoundError: If the event does not exist or was deleted.
+        """
+
+    @abstractmethod
+    def insert_event(self, calendar_id: str, body: dict[str, Any]) -> dict[str, Any]:
+        """
+        Creates an event.
+
+        Args:
+            calendar_id: The calendar to write to.
+            body: The event resource to create.
+
+        Returns:
+            The created event resource, including its ``id``.
+        """
+
+    @abstractmethod
+    def patch_event(
+        self, calendar_id: str, event_id: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Applies patch semantics to an event: only the given fields change and nested
+        objects are merged.
+
+        Args:
+            calendar_id: The calendar to write to.
+            event_id: The ID of the event.
+            body: The partial event resource.
+
+        Returns:
+            The full updated event resource.
+
+        Raises:
+            EventNotFoundError: If the event does not exist or was deleted.
+        """
+
+    @abstractmethod
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        """
+        Deletes an event.
+
+        Args:
+            calendar_id: The calendar to write to.
+            event_id: The ID of the event.
+
+        Raises:
+            EventNotFoundError: If the event does not exist or was deleted.
+        """
+
+
+def _execute_event_request(request: Any, calendar_id: str, event_id: str) -> Any:
+    """
+    Executes a request on a single event, converting "not found" (404) and "gone"
+    (410) responses into EventNotFoundError.
+    """
+    try:
+        return request.execute()
+    except HttpError as e:
+        if int(e.resp.status) in (404, 410):
+            raise EventNotFoundError(
+                f"Event '{event_id}' not found in calendar '{calendar_id}'."
+            ) from e
+        raise
+
+
+class GoogleApiBackend(CalendarBackend):
+    """
+    Backend that forwards every call to a ``googleapiclient`` Calendar v3 service.
+    """
+
+    def __init__(self, service: Any, service_factory: Callable[[], Any] | None = None):
+        """
+        Args:
+            service: A service object built with ``build("calendar", "v3", ...)``.
+            service_factory: Builds another service object with its own HTTP
+                connection, used by ``fork`` (optional).
+        """
+        self.service = service
+        self.service_factory = service_factory
+
+    def fork(self) -> "GoogleApiBackend | None":
+        # httplib2 connections are not thread-safe, so a fork needs its own service.
+        if self.service_factory is None:
+            return None
+        return GoogleApiBackend(self.service_factory(), self.service_factory)
+
+    def list_calendars(self, page_token: str | None = None) -> dict[str, Any]:
+        params: dict[str, Any] = {"maxResults": DEFAULT_MAX_RESULTS}
+        if page_token:
+            params["pageToken"] = page_token
+        return self.service.calendarList().list(**params).execute()
+
+    def get_calendar(self, calendar_id: str) -> dict[str, Any]:
+        try:
+            return self.service.calendars().get(calendarId=calendar_id).execute()
+        except HttpError as e:
+            if int(e.resp.status) in (404, 410):
+                raise CalendarNotFoundError(
+                    f"Calendar '{calendar_id}' not found."
+                ) from e
+            raise
+
+    def list_events(
+        self,
+        calendar_id: str,
+        time_min: str,
+        time_max: str,
+        page_token: str | None = None,
+        max_results: int | None = None,
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "calendarId": calendar_id,
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "singleEvents": True,
+            "orderBy": "startTime",
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        if max_results:
+            params["maxResults"] = max_results
+        return self.service.events().list(**params).execute()
+
+    def get_event(self, calendar_id: str, event_id: str) -> dict[str, Any]:
+        request = self.service.events().get(calendarId=calendar_id, eventId=event_id)
+        return _execute_event_request(request, calendar_id, event_id)
+
+    def insert_event(self, calendar_id: str, body: dict[str, Any]) -> dict[str, Any]:
+        return self.service.events().insert(calendarId=calendar_id, body=body).execute()
+
+    def patch_event(
+        self, calendar_id: str, event_id: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        request = self.service.events().patch(
+            calendarId=calendar_id, eventId=event_id, body=body
+        )
+        return _execute_event_request(request, calendar_id, event_id)
+
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        request = self.service.events().delete(calendarId=calendar_id, eventId=event_id)
+        _execute_event_request(request, calendar_id, event_id)
+
+
+def _to_timestamp(value: str, time_zone: str | None = None) -> float:
+    """
+    Converts an RFC3339 / ISO 8601 string to a POSIX timestamp. Naive values are
+    interpreted in ``time_zone`` when given, otherwise in UTC.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo(time_zone) if time_zone else timezone.utc)
+    return dt.timestamp()
+
+
+def _event_time(field: dict[str, Any]) -> float:
+    """
+    Returns the timestamp of an event ``start`` or ``end`` object. All-day events
+    (``date``) are anchored at midnight UTC.
+    """
+    if "dateTime" in field:
+        return _to_timestamp(field["dateTime"], field.get("timeZone"))
+    return _to_timestamp(field["date"])
+
+
+def _validate_times(event: dict[str, Any]) -> None:
+    """
+    Checks that an event has parseable ``start`` and ``end`` times.
+    """
+    for field in ("start", "end"):
+        value = event.get(field)
+        if not isinstance(value, dict) or not (
+            value.get("dateTime") or value.get("date")
+        ):
+            raise ValueError(f"Event is missing '{field}.dateTime' or '{field}.date'.")
+        try:
+            _event_time(value)
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Invalid event '{field}': {value}") from e
+
+
+def _merge(target: dict[str, Any], patch: dict[str, Any]) -> None:
+    """
+    Recursively merges ``patch`` into ``target`` following the API patch semantics.
+    """
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _encode_page_token(key: tuple[float, str]) -> str:
+    raw = json.dumps(list(key)).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_page_token(token: str) -> tuple[float, str]:
+    try:
+        start, event_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token}") from e
+    return float(start), str(event_id)
+
+
+def _calendar_entry(
+    calendar_id: str,
+    time_zone: str,
+    access_role: str = "owner",
+    summary: str | None = None,
+    primary: bool = False,
+) -> dict[str, Any]:
+    """
+    Builds a calendar list entry resource.
+    """
+    entry: dict[str, Any] = {
+        "kind": "calendar#calendarListEntry",
+        "id": calendar_id,
+        "summary": summary or calendar_id,
+        "timeZone": time_zone,
+        "accessRole": access_role,
+    }
+    if primary or calendar_id == "primary":
+        entry["primary"] = True
+    return entry
+
+
+class _CalendarStore:
+    """
+    Events of a single calendar, indexed by ID and by ``(start, id)``.
+    """
+
+    def __init__(self, entry: dict[str, Any]):
+        self.entry = entry
+        self.listed = True
+        self.events: dict[str, dict[str, Any]] = {}
+        self.keys: dict[str, tuple[float, str]] = {}
+        self.index: list[tuple[float, str]] = []
+        # Longest event seen so far; bounds how far before ``time_min`` an
+        # overlapping event can start.
+        self.max_duration = 0.0
+
+    def put(self, event: dict[str, Any]) -> None:
+        event_id = event["id"]
+        # Parse before touching the indexes so an invalid event leaves the store as is.
+        start = _event_time(event["start"])
+        end = _event_time(event["end"])
+        self.remove(event_id)
+        key = (start, event_id)
+        bisect.insort(self.index, key)
+        self.keys[event_id] = key
+        self.events[event_id] = event
+        self.max_duration = max(self.max_duration, end - start)
+
+    def remove(self, event_id: str) -> dict[str, Any] | None:
+        key = self.keys.pop(event_id, None)
+        if key is None:
+            return None
+        del self.index[bisect.bisect_left(self.index, key)]
+        return self.events.pop(event_id)
+
+
+class InMemoryBackend(CalendarBackend):
+    """
+    In-process backend that keeps events in time-indexed structures.
+
+    It mirrors the list, get, insert, patch and delete semantics of the Calendar API,
+    including paging through ``nextPageToken``, which makes it suitable for tests and
+    simulations that must not touch the network.
+    """
+
+    def __init__(self, time_zone: str = "UTC"):
+        """
+        Args:
+            time_zone: The default time zone of calendars, including ``primary``.
+        """
+        self.time_zone = time_zone
+        self._calendars: dict[str, _CalendarStore] = {}
+        self._lock = threading.RLock()
+        self.add_calendar("primary")
+
+    def add_calendar(
+        self,
+        calendar_id: str,
+        time_zone: str | None = None,
+        access_role: str = "owner",
+        summary: str | None = None,
+        primary: bool = False,
+        listed: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Adds a calendar, or replaces the metadata of an existing one.
+
+        Args:
+            calendar_id: The ID of the calendar.
+            time_zone: The time zone of the calendar (optional).
+            access_role: The user's access role on the calendar.
+            summary: The title of the calendar (optional).
+            primary: Whether this is the user's primary calendar.
+            listed: Whether the calendar is on the user's calendar list. Unlisted
+                calendars model shared calendars used by ID without subscribing.
+
+        Returns:
+            The calendar list entry.
+        """
+        entry = _calendar_entry(
+            calendar_id, time_zone or self.time_zone, access_role, summary, primary
+        )
+        with self._lock:
+            store = self._calendars.get(calendar_id)
+            if store is None:
+                store = self._calendars[calendar_id] = _CalendarStore(entry)
+            store.entry = entry
+            store.listed = listed
+        return copy.deepcopy(entry)
+
+    def _store(self, calendar_id: str) -> _CalendarStore:
+        store = self._calendars.get(calendar_id)
+        if store is None:
+            raise CalendarNotFoundError(f"Calendar '{calendar_id}' not found.")
+        return store
+
+    def list_calendars(self, page_token: str | None = None) -> dict[str, Any]:
+        with self._lock:
+            items = [
+                copy.deepcopy(s.entry) for s in self._calendars.values() if s.listed
+            ]
+        return {"kind": "calendar#calendarList", "items": items}
+
+    def get_calendar(self, calendar_id: str) -> dict[str, Any]:
+        with self._lock:
+            entry = self._store(calendar_id).entry
+            return {
+                "kind": "calendar#calendar",
+                "id": entry["id"],
+                "summary": entry["summary"],
+                "timeZone": entry["timeZone"],
+            }
+
+    def _require(self, calendar_id: str, event_id: str) -> dict[str, Any]:
+        event = self._store(calendar_id).events.get(event_id)
+        if event is None:
+            raise EventNotFoundError(
+                f"Event '{event_id}' not found in calendar '{calendar_id}'."
+            )
+        return event
+
+    def list_events(
+        self,
+        calendar_id: str,
+        time_min: str,
+        time_max: str,
+        page_token: str | None = None,
+        max_results: int | None = None,
+    ) -> dict[str, Any]:
+        lower = _to_timestamp(time_min)
+        upper = _to_timestamp(time_max)
+        limit = max_results or DEFAULT_MAX_RESULTS
+
+        with self._lock:
+            store = self._store(calendar_id)
+            index = store.index
+            if page_token:
+                position = bisect.bisect_right(index, _decode_page_token(page_token))
+            else:
+                position = bisect.bisect_left(index, (lower - store.max_duration, ""))
+            stop = bisect.bisect_left(index, (upper, ""))
+
+            items: list[dict[str, Any]] = []
+            next_key = None
+            while position < stop:
+                event = store.events[index[position][1]]
+                position += 1
+                if _event_time(event["end"]) <= lower:
+                    continue
+                if len(items) == limit:
+                    next_key = store.keys[items[-1]["id"]]
+                    break
+                items.append(copy.deepcopy(event))
+
+        result: dict[str, Any] = {
+            "kind": "calendar#events",
+            "summary": calendar_id,
+            "items": items,
+        }
+        if next_key is not None:
+            result["nextPageToken"] = _encode_page_token(next_key)
+        return result
+
+    def get_event(self, calendar_id: str, event_id: str) -> dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self._require(calendar_id, event_id))
+
+    def insert_event(self, calendar_id: str, body: dict[str, Any]) -> dict[str, Any]:
+        now = datetime.now(timezone.utc).isoformat()
+        event = {k: copy.deepcopy(v) for k, v in body.items() if v is not None}
+        _validate_times(event)
+        event.setdefault("id", uuid.uuid4().hex)
+        event.update(
+            {
+                "kind": "calendar#event",
+                "status": "confirmed",
+                "created": now,
+                "updated": now,
+            }
+        )
+        with self._lock:
+            store = self._store(calendar_id)
+            if event["id"] in store.events:
+                raise ValueError(
+                    f"Event '{event['id']}' already exists in calendar '{calendar_id}'."
+                )
+            store.put(event)
+            return copy.deepcopy(event)
+
+    def patch_event(
+        self, calendar_id: str, event_id: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        with self._lock:
+            event = copy.deepcopy(self._require(calendar_id, event_id))
+            _merge(event, copy.deepcopy(body))
+            _validate_times(event)
+            event["id"] = event_id
+            event["updated"] = datetime.now(timezone.utc).isoformat()
+            self._store(calendar_id).put(event)
+            return copy.deepcopy(event)
+
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        with self._lock:
+            self._require(calendar_id, event_id)
+            self._store(calendar_id).remove(event_id)
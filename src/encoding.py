@@ -0,0 +1,276 @@
+import base64
+import json
+from itertools import islice
+from typing import Any, Callable
+
+# Rough characters-per-token ratio of JSON text for common LLM tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Appended to text clipped to fit the budget.
+TRUNCATION_MARKER = " [truncated]"
+
+# Text fields of a compact event, in the order they are clipped.
+CLIPPED_FIELDS = ("description", "location", "summary")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _compact_time(field: dict[str, Any] | None) -> str | None:
+    """
+    Collapses an event ``start`` or ``end`` object into a single string.
+    """
+    if not field:
+        return None
+    if "dateTime" in field:
+        return field["dateTime"]
+    return field.get("date")
+
+
+def encode_cursor(
+    time_min: str, time_max: str, page_token: str | None, position: int
+) -> str:
+    """
+    Encodes a continuation cursor for an events query.
+
+    Args:
+        time_min: The normalized lower bound of the query.
+        time_max: The normalized upper bound of the query.
+        page_token: The backend page token of the page to continue in, or None for
+            the first page.
+        position: The number of events of that page already returned.
+
+    Returns:
+        An opaque cursor string.
+    """
+    raw = _dumps([time_min, time_max, page_token, position]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(
+    cursor: str | None, time_min: str, time_max: str
+) -> tuple[str | None, int]:
+    """
+    Decodes a continuation cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor string, or None for the first page.
+        time_min: The normalized lower bound of the current query.
+        time_max: The normalized upper bound of the current query.
+
+    Returns:
+        The backend page token and the position within that page.
+    """
+    if not cursor:
+        return None, 0
+    try:
+        cursor_min, cursor_max, page_token, position = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if (cursor_min, cursor_max) != (time_min, time_max):
+        raise ValueError(
+            f"Cursor belongs to the query {cursor_min} - {cursor_max}, "
+            f"not {time_min} - {time_max}."
+        )
+    if not isinstance(position, int) or position < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return page_token, position
+
+
+class ResultEncoder:
+    """
+    Encodes tool results into compact JSON strings for LLM consumption.
+
+    Events are projected to a small schema, people (attendees and organizers) are
+    deduplicated into a shared table, and lists are truncated to a character or token
+    budget with a continuation cursor.
+    """
+
+    def __init__(self, max_chars: int | None = None, max_tokens: int | None = None):
+        """
+        Args:
+            max_chars: Maximum size of an encoded result in characters (optional).
+            max_tokens: Maximum estimated size of an encoded result in tokens
+                (optional).
+        """
+        limits = [max_chars] if max_chars else []
+        if max_tokens:
+            limits.append(max_tokens * CHARS_PER_TOKEN)
+        self.budget = min(limits) if limits else None
+
+    def _person_ref(self, person: dict[str, Any], refs: dict[str, str]) -> str:
+        """
+        Returns the reference of a person, adding it to ``refs`` if new.
+        """
+        label = person.get("email") or person.get("displayName") or "unknown"
+        if person.get("displayName") and person.get("email"):
+            label = f"{person['displayName']} <{person['email']}>"
+        ref = refs.get(label)
+        if ref is None:
+            ref = refs[label] = f"p{len(refs) + 1}"
+        return ref
+
+    def compact_event(
+        self, event: dict[str, Any], refs: dict[str, str]
+    ) -> dict[str, Any]:
+        """
+        Projects an event resource to the compact schema.
+
+        Args:
+            event: The event resource returned by the backend.
+            refs: The shared people table mapping labels to references, updated in
+                place.
+
+        Returns:
+            The compact event, without empty fields.
+        """
+        compact: dict[str, Any] = {
+            "id": event.get("id"),
+            "summary": event.get("summary"),
+            "start": _compact_time(event.get("start")),
+            "end": _compact_time(event.get("end")),
+            "location": event.get("location"),
+            "description": event.get("description"),
+        }
+        if event.get("status") not in (None, "confirmed"):
+            compact["status"] = event["status"]
+        if event.get("organizer"):
+            compact["organizer"] = self._person_ref(event["organizer"], refs)
+        attendees = event.get("attendees") or []
+        if attendees:
+            compact["attendees"] = [
+                self._person_ref(attendee, refs) for attendee in attendees
+            ]
+        return {k: v for k, v in compact.items() if v is not None}
+
+    def _event_size(
+        self, compact: dict[str, Any], refs: dict[str, str], labels: list[str]
+    ) -> int:
+        """
+        Returns the encoded size of a compact event and of its new people entries.
+        """
+        size = len(_dumps(compact)) + 1
+        return size + sum(len(_dumps({refs[label]: label})) for label in labels)
+
+    def _fit(
+        self,
+        compact: dict[str, Any],
+        refs: dict[str, str],
+        labels: list[str],
+        room: int,
+    ) -> None:
+        """
+        Shrinks a compact event in place to ``room`` characters, including its new
+        people entries ``labels``. Long text fields are clipped first, then trailing
+        attendees are dropped and counted in ``attendeesOmitted``.
+        """
+        for field in CLIPPED_FIELDS:
+            excess = self._event_size(compact, refs, labels) - room
+            if excess <= 0:
+                return
+            value = compact.get(field)
+            if isinstance(value, str) and len(value) > len(TRUNCATION_MARKER):
+                # Dropping n characters shrinks the JSON by at least n.
+                keep = max(0, len(value) - excess - len(TRUNCATION_MARKER))
+                compact[field] = value[:keep] + TRUNCATION_MARKER
+
+        attendees = compact.get("attendees", [])
+        while attendees and self._event_size(compact, refs, labels) > room:
+            ref = attendees.pop()
+            compact["attendeesOmitted"] = compact.get("attendeesOmitted", 0) + 1
+            if ref != compact.get("organizer") and ref not in attendees:
+                # The last use of a reference is also its newest, so removing it
+                # keeps the numbering of later references unique.
+                label = next(label for label in labels if refs[label] == ref)
+                labels.remove(label)
+                del refs[label]
+        if not attendees:
+            compact.pop("attendees", None)
+
+    def encode_events(
+        self,
+        events: list[dict[str, Any]],
+        cursor_for: Callable[[int], str | None] | None = None,
+    ) -> str:
+        """
+        Encodes a list of events, truncating to the budget.
+
+        Args:
+            events: The events to encode.
+            cursor_for: Returns the cursor continuing after the first ``n`` events, or
+                None when nothing follows (optional). Without it, a truncated result
+                is only flagged with ``truncated``.
+
+        Returns:
+            A JSON string with ``events``, ``people`` and, when more events follow,
+            ``cursor``.
+        """
+        refs: dict[str, str] = {}
+        items: list[dict[str, Any]] = []
+        # Reserve room for the envelope and the longest cursor, plus slack for the
+        # position growing by a few digits.
+        cursors = [cursor_for(0), cursor_for(len(events))] if cursor_for else []
+        cursor = max((c or "" for c in cursors), key=len, default="")
+        envelope = {"events": [], "people": {}, "cursor": cursor, "truncated": True}
+        size = len(_dumps(envelope)) + 8
+
+        for event in events:
+            known = len(refs)
+            compact = self.compact_event(event, refs)
+            new_labels = list(islice(reversed(refs), len(refs) - known))
+            added = self._event_size(compact, refs, new_labels)
+            if self.budget is not None and size + added > self.budget:
+                if items:
+                    for label in new_labels:
+                        del refs[label]
+                    break
+                # The first event is always returned, shrunk to fit on its own.
+                self._fit(compact, refs, new_labels, self.budget - size)
+                added = self._event_size(compact, refs, new_labels)
+            items.append(compact)
+            size += added
+
+        result: dict[str, Any] = {"events": items}
+        if refs:
+            result["people"] = {ref: label for label, ref in refs.items()}
+        if cursor_for:
+            next_cursor = cursor_for(len(items))
+            if next_cursor:
+                result["cursor"] = next_cursor
+        elif len(items) < len(events):
+            result["truncated"] = True
+        return _dumps(result)
+
+    def encode(self, result: Any) -> str:
+        """
+        Encodes any tool result into a string.
+
+        Args:
+            result: The value returned by a GoogleCalendar method.
+
+        Returns:
+            The encoded result, shrunk to the budget.
+        """
+        if isinstance(result, str):
+            if self.budget is not None and len(result) > self.budget:
+                keep = max(0, self.budget - len(TRUNCATION_MARKER))
+                return result[:keep] + TRUNCATION_MARKER
+            return result
+        if isinstance(result, list):
+            return self.encode_events(result)
+        if isinstance(result, dict) and "start" in result and "end" in result:
+            refs: dict[str, str] = {}
+            compact = self.compact_event(result, refs)
+            if self.budget is not None:
+                # Room for the "people" key wrapping the people entries.
+                room = self.budget - len(',"people":{}')
+                self._fit(compact, refs, list(refs), room)
+            if refs:
+                compact["people"] = {ref: label for label, ref in refs.items()}
+            return _dumps(compact)
+        if result is None:
+            return "OK"
+        return _dumps(result)
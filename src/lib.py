@@ -1,16 +1,44 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Callable
+from zoneinfo import ZoneInfo
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 
 from src.utils import function_to_schema, parse_datetime
+from .backends import CalendarBackend, GoogleApiBackend
 from .config import Config
+from .encoding import ResultEncoder, decode_cursor, encode_cursor
+from .metadata import DEFAULT_METADATA_TTL, CalendarMetadataCache
+from .singleflight import SingleFlight
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Time zone used when the calendar's own time zone is unknown.
+DEFAULT_TIME_ZONE = "UTC"
+
+# Access roles that cannot modify events.
+READ_ONLY_ACCESS_ROLES = {"freeBusyReader", "reader"}
+
+# Worker threads serving async reads when the backend can fork.
+ASYNC_READ_WORKERS = 8
+
+# Public methods that are not exposed to the LLM as tools.
+_NON_TOOL_METHODS = {"call_function", "get_event_async", "get_events_async"}
+
 
 class GoogleCalendar:
     def __init__(
-        self, config_path: str = "tools.yaml", tool_name: str = "google-calendar"
+        self,
+        config_path: str = "tools.yaml",
+        tool_name: str = "google-calendar",
+        backend: CalendarBackend | None = None,
+        result_encoder: ResultEncoder | None = None,
+        coalesce_window: float = 0.0,
+        metadata_ttl: float = DEFAULT_METADATA_TTL,
     ):
         """
         Initializes the GoogleCalendar tool with user credentials and builds the service object.
@@ -18,16 +46,44 @@ class GoogleCalendar:
         Args:
             config_path: Path to the YAML configuration file.
             tool_name: The name of the tool in the configuration file.
+            backend: The backend to store events in (optional). Defaults to the Google
+                Calendar API using the configured credentials.
+            result_encoder: The encoder used by call_function to serialize tool
+                results (optional). Defaults to an encoder without size budget.
+            coalesce_window: Seconds a completed read is reused by identical reads
+                (optional). Concurrent identical reads always share one call.
+            metadata_ttl: Seconds after which cached calendar metadata (time zones
+                and access roles) is refreshed in the background.
         """
         config = Config(config_path)
         self.tool_config = config.get_tool_config(tool_name)
         self.credentials_value = config.get_credential_value(tool_name)
         self.credentials_path = config.get_credential_path(tool_name)
         self.default_calendar_id = config.get_default_calendar_id(tool_name)
-        self.credentials = self._load_credentials(
-            self.credentials_path, credential_value=self.credentials_value
-        )
-        self.service = build("calendar", "v3", credentials=self.credentials)
+        self.credentials = None
+        self.service = None
+        if backend is None:
+            self.credentials = self._load_credentials(
+                self.credentials_path, credential_value=self.credentials_value
+            )
+            self.service = self._build_service()
+            backend = GoogleApiBackend(
+                self.service, service_factory=self._build_service
+            )
+        self.backend = backend
+        self.result_encoder = result_encoder or ResultEncoder()
+        self._reads = SingleFlight(coalesce_window)
+        self.calendars = CalendarMetadataCache(backend, ttl=metadata_ttl)
+        # Async reads run on dedicated workers, each with its own forked backend.
+        self._read_executor: ThreadPoolExecutor | None = None
+        self._read_executor_lock = threading.Lock()
+        self._worker = threading.local()
+
+    def _build_service(self):
+        """
+        Builds a Calendar v3 service object with its own HTTP connection.
+        """
+        return build("calendar", "v3", credentials=self.credentials)
 
     def _load_credentials(
         self, credentials_path: str | None, credential_value: dict | None = None
@@ -50,6 +106,35 @@ class GoogleCalendar:
             creds = Credentials.from_authorized_user_file(credentials_path, SCOPES)
         return creds
 
+    def _time_zone(self) -> str:
+        """
+        Resolves the time zone of the default calendar from the metadata cache.
+
+        Returns:
+            The IANA time zone name of the default calendar.
+        """
+        return self.calendars.time_zone(self.default_calendar_id) or DEFAULT_TIME_ZONE
+
+    def _check_writable(self) -> None:
+        """
+        Fails fast when the user cannot modify events on the default calendar.
+        """
+        access_role = self.calendars.access_role(self.default_calendar_id)
+        if access_role in READ_ONLY_ACCESS_ROLES:
+            raise PermissionError(
+                f"Calendar '{self.default_calendar_id}' is read-only "
+                f"(access role '{access_role}')."
+            )
+
+    def _to_rfc3339(self, value: datetime) -> str:
+        """
+        Formats a datetime as RFC3339, interpreting naive values in the default
+        calendar's time zone.
+        """
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=ZoneInfo(self._time_zone()))
+        return value.isoformat()
+
     def get_current_datetime_utc(self) -> str:
         """
         Retrieves the current date and time in UTC.
@@ -80,8 +165,10 @@ class GoogleCalendar:
         Returns:
             The ID of the created event.
         """
+        self._check_writable()
         start_time_dt = parse_datetime(start_time)
         end_time_dt = parse_datetime(end_time)
+        time_zone = self._time_zone()
 
         event = {
             "summary": summary,
@@ -89,48 +176,147 @@ class GoogleCalendar:
             "description": description,
             "start": {
                 "dateTime": start_time_dt.isoformat(),
-                "timeZone": "America/Los_Angeles",  # Replace with your timezone
+                "timeZone": time_zone,
             },
             "end": {
                 "dateTime": end_time_dt.isoformat(),
-                "timeZone": "America/Los_Angeles",  # Replace with your timezone
+                "timeZone": time_zone,
             },
         }
 
-        created_event = (
-            self.service.events()
-            .insert(calendarId=self.default_calendar_id, body=event)
-            .execute()
-        )
+        created_event = self.backend.insert_event(self.default_calendar_id, event)
+        self._reads.forget()
         return created_event["id"]
 
-    def get_events(self, time_min: str, time_max: str) -> list:
+    def get_events(
+        self, time_min: str, time_max: str, cursor: str | None = None
+    ) -> list:
         """
         Retrieves events within a specified time range.
 
         Args:
             time_min: The minimum time (inclusive) for events to be retrieved as a string.
             time_max: The maximum time (exclusive) for events to be retrieved as a string.
+            cursor: The cursor returned by a previous truncated result, to continue
+                from (optional).
 
         Returns:
-            A list of events.
+            A list of events, following every backend page.
+        """
+        time_min_str, time_max_str = self._time_range(time_min, time_max)
+        page_token, position = decode_cursor(cursor, time_min_str, time_max_str)
+
+        events: list = []
+        while True:
+            events_result = self._list_events_page(
+                time_min_str, time_max_str, page_token
+            )
+            events += events_result.get("items", [])[position:]
+            page_token = events_result.get("nextPageToken")
+            position = 0
+            if not page_token:
+                return events
+
+    def _time_range(self, time_min: str, time_max: str) -> tuple[str, str]:
+        """
+        Parses and normalizes the bounds of an events query to RFC3339.
         """
         time_min_dt = parse_datetime(time_min)
         time_max_dt = parse_datetime(time_max)
+        return self._to_rfc3339(time_min_dt), self._to_rfc3339(time_max_dt)
+
+    def _list_events_request(
+        self, time_min: str, time_max: str, page_token: str | None
+    ) -> tuple[tuple, Callable[[], dict]]:
+        """
+        Returns the single-flight key and call for one backend page of an events
+        query.
+        """
+        calendar_id = self.default_calendar_id
+        key = ("list_events", calendar_id, time_min, time_max, page_token)
+        return key, lambda: self._thread_backend().list_events(
+            calendar_id, time_min=time_min, time_max=time_max, page_token=page_token
+        )
+
+    def _list_events_page(
+        self, time_min: str, time_max: str, page_token: str | None
+    ) -> dict:
+        """
+        Fetches one backend page of an events query, sharing identical reads.
+        """
+        return self._reads.do(
+            *self._list_events_request(time_min, time_max, page_token)
+        )
+
+    def _get_event_request(self, event_id: str) -> tuple[tuple, Callable[[], dict]]:
+        """
+        Returns the single-flight key and call for reading one event.
+        """
+        calendar_id = self.default_calendar_id
+        key = ("get_event", calendar_id, event_id)
+        return key, lambda: self._thread_backend().get_event(calendar_id, event_id)
+
+    def _thread_backend(self) -> CalendarBackend:
+        """
+        Returns the backend of the current async read worker, or the shared backend
+        on any other thread.
+        """
+        return getattr(self._worker, "backend", self.backend)
+
+    def _init_read_worker(self, fork: bool) -> None:
+        self._worker.backend = self.backend.fork() if fork else self.backend
+
+    def _async_read_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the executor for async reads. Every worker owns a forked backend, so
+        backends that are not thread-safe are never shared between workers. Without
+        fork support, a single worker uses the shared backend.
+        """
+        with self._read_executor_lock:
+            if self._read_executor is None:
+                can_fork = self.backend.fork() is not None
+                self._read_executor = ThreadPoolExecutor(
+                    max_workers=ASYNC_READ_WORKERS if can_fork else 1,
+                    thread_name_prefix="calendar-read",
+                    initializer=self._init_read_worker,
+                    initargs=(can_fork,),
+                )
+            return self._read_executor
+
+    def _encode_events_page(
+        self, time_min: str, time_max: str, cursor: str | None = None
+    ) -> str:
+        """
+        Encodes the events from ``cursor`` onward, fetching a single backend page.
+        The result carries a cursor for the next call while events remain.
+        """
+        time_min_str, time_max_str = self._time_range(time_min, time_max)
+        page_token, position = decode_cursor(cursor, time_min_str, time_max_str)
 
-        events_result = (
-            self.service.events()
-            .list(
-                calendarId=self.default_calendar_id,
-                timeMin=time_min_dt.isoformat() + "Z",
-                timeMax=time_max_dt.isoformat() + "Z",
-                singleEvents=True,
-                orderBy="startTime",
+        events_result = self._list_events_page(time_min_str, time_max_str, page_token)
+        items = events_result.get("items", [])
+        # Skip pages with nothing left to return.
+        while position >= len(items) and events_result.get("nextPageToken"):
+            page_token = events_result["nextPageToken"]
+            position = 0
+            events_result = self._list_events_page(
+                time_min_str, time_max_str, page_token
             )
-            .execute()
+            items = events_result.get("items", [])
+        next_page_token = events_result.get("nextPageToken")
+
+        def cursor_for(count: int) -> str | None:
+            if position + count < len(items):
+                return encode_cursor(
+                    time_min_str, time_max_str, page_token, position + count
+                )
+            if next_page_token:
+                return encode_cursor(time_min_str, time_max_str, next_page_token, 0)
+            return None
+
+        return self.result_encoder.encode_events(
+            items[position:], cursor_for=cursor_for
         )
-        events = events_result.get("items", [])
-        return events
 
     def get_event(self, event_id: str) -> dict:
         """
@@ -142,13 +328,59 @@ class GoogleCalendar:
         Returns:
             The event details.
         """
-        event = (
-            self.service.events()
-            .get(calendarId=self.default_calendar_id, eventId=event_id)
-            .execute()
-        )
+        event = self._reads.do(*self._get_event_request(event_id))
         return event
 
+    async def get_events_async(
+        self, time_min: str, time_max: str, cursor: str | None = None
+    ) -> list:
+        """
+        Asyncio counterpart of get_events. Identical concurrent reads, from
+        coroutines or threads, share one backend call.
+
+        Args:
+            time_min: The minimum time (inclusive) for events to be retrieved as a string.
+            time_max: The maximum time (exclusive) for events to be retrieved as a string.
+            cursor: The cursor returned by a previous truncated result, to continue
+                from (optional).
+
+        Returns:
+            A list of events, following every backend page.
+        """
+        # The first time zone lookup may load calendar metadata, so keep it off
+        # the event loop.
+        time_min_str, time_max_str = await asyncio.to_thread(
+            self._time_range, time_min, time_max
+        )
+        page_token, position = decode_cursor(cursor, time_min_str, time_max_str)
+
+        events: list = []
+        while True:
+            events_result = await self._reads.do_async(
+                *self._list_events_request(time_min_str, time_max_str, page_token),
+                executor=self._async_read_executor(),
+            )
+            events += events_result.get("items", [])[position:]
+            page_token = events_result.get("nextPageToken")
+            position = 0
+            if not page_token:
+                return events
+
+    async def get_event_async(self, event_id: str) -> dict:
+        """
+        Asyncio counterpart of get_event. Identical concurrent reads, from coroutines
+        or threads, share one backend call.
+
+        Args:
+            event_id: The ID of the event to retrieve.
+
+        Returns:
+            The event details.
+        """
+        return await self._reads.do_async(
+            *self._get_event_request(event_id), executor=self._async_read_executor()
+        )
+
     def update_event(
         self,
         event_id: str,
@@ -172,30 +404,32 @@ class GoogleCalendar:
         Returns:
             The updated event details.
         """
-        event = (
-            self.service.events()
-            .get(calendarId=self.default_calendar_id, eventId=event_id)
-            .execute()
-        )
+        self._check_writable()
+        patch: dict = {}
 
         if summary:
-            event["summary"] = summary
+            patch["summary"] = summary
         if start_time:
             start_time_dt = parse_datetime(start_time)
-            event["start"]["dateTime"] = start_time_dt.isoformat()
+            patch["start"] = {
+                "dateTime": start_time_dt.isoformat(),
+                "timeZone": self._time_zone(),
+            }
         if end_time:
             end_time_dt = parse_datetime(end_time)
-            event["end"]["dateTime"] = end_time_dt.isoformat()
+            patch["end"] = {
+                "dateTime": end_time_dt.isoformat(),
+                "timeZone": self._time_zone(),
+            }
         if description:
-            event["description"] = description
+            patch["description"] = description
         if location:
-            event["location"] = location
+            patch["location"] = location
 
-        updated_event = (
-            self.service.events()
-            .update(calendarId=self.default_calendar_id, eventId=event_id, body=event)
-            .execute()
+        updated_event = self.backend.patch_event(
+            self.default_calendar_id, event_id, patch
         )
+        self._reads.forget()
         return updated_event
 
     def delete_event(self, event_id: str) -> None:
@@ -205,9 +439,42 @@ class GoogleCalendar:
         Args:
             event_id: The ID of the event to delete.
         """
-        self.service.events().delete(
-            calendarId=self.default_calendar_id, eventId=event_id
-        ).execute()
+        self._check_writable()
+        self.backend.delete_event(self.default_calendar_id, event_id)
+        self._reads.forget()
+
+    def call_function(self, name: str, arguments: str | dict) -> str:
+        """
+        Calls one of the functions listed in ``functions`` and encodes its result for
+        the LLM.
+
+        Args:
+            name: The name of the function to call.
+            arguments: The function arguments, as a JSON string or a dictionary.
+
+        Returns:
+            The encoded result, truncated to the encoder's budget.
+        """
+        if name not in self._function_names():
+            raise ValueError(f"Unknown function '{name}'.")
+        kwargs: dict = (
+            json.loads(arguments or "{}") if isinstance(arguments, str) else arguments
+        )
+
+        if name == "get_events":
+            return self._encode_events_page(**kwargs)
+        result = getattr(self, name)(**kwargs)
+        return self.result_encoder.encode(result)
+
+    @staticmethod
+    def _function_names() -> list:
+        return [
+            method
+            for method in dir(GoogleCalendar)
+            if callable(getattr(GoogleCalendar, method))
+            and not method.startswith("_")
+            and method not in _NON_TOOL_METHODS
+        ]
 
     @property
     def functions(self):
@@ -216,6 +483,5 @@ class GoogleCalendar:
         """
         return [
             function_to_schema(getattr(self, method))
-            for method in dir(GoogleCalendar)
-            if callable(getattr(GoogleCalendar, method)) and not method.startswith("_")
+            for method in self._function_names()
         ]
@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from typing import Any
+
+from .backends import CalendarBackend, CalendarNotFoundError
+from .singleflight import SingleFlight
+
+DEFAULT_METADATA_TTL = 300.0
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarMetadataCache:
+    """
+    Local cache of the user's calendar list: time zones, access roles and titles.
+
+    The whole list is loaded with one paged listing on first use. Once the TTL has
+    elapsed, lookups keep serving the cached entries while a background thread
+    reloads the list through a forked backend, so callers never wait on a refresh
+    after the first load. Backends that cannot fork are refreshed in the caller's
+    thread instead.
+    """
+
+    def __init__(self, backend: CalendarBackend, ttl: float = DEFAULT_METADATA_TTL):
+        """
+        Args:
+            backend: The backend to list calendars from.
+            ttl: Seconds after which the cached list is refreshed. Failed refreshes
+                are retried after the same delay.
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._loads = SingleFlight()
+        # Backend used by the refresh thread, forked on first use so it does not
+        # share a connection with the caller's thread.
+        self._refresh_backend: CalendarBackend | None = None
+        self._forked = False
+        # Time zones of calendars missing from the list, resolved one by one and
+        # kept until the next successful listing.
+        self._resolved: dict[str, str | None] = {}
+
+    def _load(self, backend: CalendarBackend) -> dict[str, dict[str, Any]]:
+        """
+        Lists every calendar and indexes the entries by ID. The primary calendar is
+        also indexed under ``primary``.
+        """
+        entries: dict[str, dict[str, Any]] = {}
+        page_token = None
+        while True:
+            result = backend.list_calendars(page_token=page_token)
+            for entry in result.get("items", []):
+                entries[entry["id"]] = entry
+                if entry.get("primary"):
+                    entries["primary"] = entry
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return entries
+
+    def _store(self, entries: dict[str, dict[str, Any]] | None) -> None:
+        """
+        Replaces the cached entries, or keeps them on failure, and restarts the TTL.
+        """
+        with self._lock:
+            if entries is not None:
+                self._entries = entries
+                self._resolved = {}
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+
+    def refresh(self) -> None:
+        """
+        Reloads the calendar list synchronously. Concurrent reloads share one listing.
+        """
+        entries = self._loads.do("calendarList", lambda: self._load(self.backend))
+        self._store(entries)
+
+    def _refresh_stale(self, backend: CalendarBackend) -> None:
+        """
+        Reloads a stale list, keeping the cached entries if the listing fails.
+        """
+        try:
+            entries = self._loads.do("calendarList", lambda: self._load(backend))
+        except Exception as e:
+            logger.warning("Refreshing the calendar list failed: %s", e)
+            entries = None
+        self._store(entries)
+
+    def _fork_backend(self) -> CalendarBackend | None:
+        if not self._forked:
+            self._forked = True
+            try:
+                self._refresh_backend = self.backend.fork()
+            except Exception as e:
+                logger.warning("Creating a calendar list refresh backend failed: %s", e)
+        return self._refresh_backend
+
+    def get(self, calendar_id: str) -> dict[str, Any] | None:
+        """
+        Retrieves the calendar list entry of a calendar.
+
+        Args:
+            calendar_id: The ID of the calendar.
+
+        Returns:
+            The calendar list entry, or None if the calendar is not on the list.
+        """
+        if self._entries is None:
+            try:
+                self.refresh()
+            except Exception as e:
+                # Serve lookups as misses and retry once the TTL has elapsed.
+                logger.warning("Loading the calendar list failed: %s", e)
+                with self._lock:
+                    if self._entries is None:
+                        self._entries = {}
+                self._store(None)
+        with self._lock:
+            stale = time.monotonic() - self._loaded_at > self.ttl
+            start_refresh = stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+            entries = self._entries or {}
+
+        if start_refresh:
+            refresh_backend = self._fork_backend()
+            if refresh_backend is None:
+                # Without an independent connection, refresh in the caller's thread.
+                self._refresh_stale(self.backend)
+                entries = self._entries or {}
+            else:
+                threading.Thread(
+                    target=self._refresh_stale, args=(refresh_backend,), daemon=True
+                ).start()
+        return entries.get(calendar_id)
+
+    def time_zone(self, calendar_id: str) -> str | None:
+        """
+        Retrieves the time zone of a calendar.
+
+        Calendars missing from the list, such as shared calendars used by ID without
+        subscribing, are resolved with a single calendar lookup whose result is
+        cached until the next listing.
+
+        Args:
+            calendar_id: The ID of the calendar.
+
+        Returns:
+            The IANA time zone name, or None if it cannot be resolved.
+        """
+        entry = self.get(calendar_id)
+        if entry:
+            return entry.get("timeZone")
+        if calendar_id not in self._resolved:
+            self._resolved[calendar_id] = self._loads.do(
+                ("calendar", calendar_id), lambda: self._resolve(calendar_id)
+            )
+        return self._resolved[calendar_id]
+
+    def _resolve(self, calendar_id: str) -> str | None:
+        try:
+            return self.backend.get_calendar(calendar_id).get("timeZone")
+        except CalendarNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Resolving the time zone of '%s' failed: %s", calendar_id, e)
+            return None
+
+    def access_role(self, calendar_id: str) -> str | None:
+        """
+        Retrieves the user's access role on a calendar.
+
+        Args:
+            calendar_id: The ID of the calendar.
+
+        Returns:
+            The access role, or None if the calendar is unknown.
+        """
+        entry = self.get(calendar_id)
+        return entry.get("accessRole") if entry else None
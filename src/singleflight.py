@@ -0,0 +1,123 @@
+import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical calls.
+
+    Callers passing the same key while a call is in flight wait for that call and
+    share its result instead of issuing their own. Threaded callers use ``do`` and
+    asyncio callers use ``do_async``; both join the same flights. With a coalescing
+    window, a successful result is also reused by identical calls arriving shortly
+    after it completed.
+    """
+
+    def __init__(self, coalesce_window: float = 0.0):
+        """
+        Args:
+            coalesce_window: Seconds a completed result is reused for (optional).
+                Defaults to 0, which only shares calls that are still in flight.
+        """
+        self.coalesce_window = coalesce_window
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._recent: dict[Hashable, tuple[float, Future]] = {}
+        # Bumped by ``forget`` so calls that started before it are not coalesced.
+        self._generation = 0
+
+    def _join(self, key: Hashable) -> tuple[Future, int | None]:
+        """
+        Returns the future for ``key`` and, if the caller must run the call, the
+        generation it starts in; otherwise None.
+        """
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is not None:
+                if recent[0] > time.monotonic():
+                    return recent[1], None
+                del self._recent[key]
+            future = self._calls.get(key)
+            if future is not None:
+                return future, None
+            future = self._calls[key] = Future()
+            return future, self._generation
+
+    def _run(
+        self, key: Hashable, future: Future, fn: Callable[[], Any], generation: int
+    ) -> None:
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn())
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            # Always detach the call, even if it was cancelled, so later callers
+            # start a fresh one.
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+                if (
+                    self.coalesce_window > 0
+                    and generation == self._generation
+                    and not future.cancelled()
+                    and future.exception() is None
+                ):
+                    now = time.monotonic()
+                    self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+                    self._recent[key] = (now + self.coalesce_window, future)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Calls ``fn`` unless an identical call is in flight, then returns the result.
+
+        Args:
+            key: Identifies identical calls.
+            fn: The call to make.
+
+        Returns:
+            A copy of the shared result, so callers can mutate it freely.
+        """
+        future, generation = self._join(key)
+        if generation is not None:
+            self._run(key, future, fn, generation)
+        return copy.deepcopy(future.result())
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Any], executor: Executor | None = None
+    ) -> Any:
+        """
+        Asyncio counterpart of ``do``. The blocking ``fn`` runs in an executor so the
+        event loop is never blocked. Cancelling one caller does not cancel the shared
+        call for the others.
+
+        Args:
+            key: Identifies identical calls.
+            fn: The call to make.
+            executor: The executor to run ``fn`` in (optional). Defaults to the
+                loop's default executor.
+
+        Returns:
+            A copy of the shared result, so callers can mutate it freely.
+        """
+        future, generation = self._join(key)
+        if generation is not None:
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(executor, self._run, key, future, fn, generation)
+        result = await asyncio.shield(asyncio.wrap_future(future))
+        return copy.deepcopy(result)
+
+    def forget(self) -> None:
+        """
+        Drops coalesced results and detaches in-flight calls, so subsequent calls
+        observe fresh data. Callers already waiting still get their call's result.
+        """
+        with self._lock:
+            self._recent.clear()
+            self._calls.clear()
+            self._generation += 1
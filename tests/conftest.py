@@ -2,6 +2,10 @@ import pytest
 import json
 import os
 import tempfile
+import threading
+import time
+
+from src import InMemoryBackend
 
 
 @pytest.fixture(scope="session")
@@ -40,3 +44,54 @@ def setup_environment(google_calendar_credential_path):
     os.environ["GOOGLE_CALENDAR_CREDENTIAL_JSON"] = google_calendar_credential_path
     yield
     del os.environ["GOOGLE_CALENDAR_CREDENTIAL_JSON"]
+
+
+class RecordingBackend(InMemoryBackend):
+    """
+    InMemoryBackend that records the backend calls made through it.
+    """
+
+    def __init__(self, page_size: int | None = None, delay: float = 0.0, **kwargs):
+        """
+        Args:
+            page_size: Forces every events page to at most this many events.
+            delay: Seconds every recorded call sleeps, to keep calls in flight.
+        """
+        super().__init__(**kwargs)
+        self.page_size = page_size
+        self.delay = delay
+        self.calls: list[str] = []
+        self.threads: list[str] = []
+
+    def _record(self, name: str) -> None:
+        self.calls.append(name)
+        self.threads.append(threading.current_thread().name)
+        if self.delay:
+            time.sleep(self.delay)
+
+    def list_calendars(self, page_token=None):
+        self._record("list_calendars")
+        return super().list_calendars(page_token=page_token)
+
+    def get_calendar(self, calendar_id):
+        self._record("get_calendar")
+        return super().get_calendar(calendar_id)
+
+    def list_events(self, *args, **kwargs):
+        self._record("list_events")
+        if self.page_size:
+            kwargs["max_results"] = self.page_size
+        return super().list_events(*args, **kwargs)
+
+    def get_event(self, *args, **kwargs):
+        self._record("get_event")
+        return super().get_event(*args, **kwargs)
+
+
+@pytest.fixture
+def recording_backend():
+    """
+    Fixture providing the RecordingBackend class, to instantiate with test-specific
+    options.
+    """
+    return RecordingBackend
@@ -0,0 +1,172 @@
+from unittest.mock import MagicMock
+
+import pytest
+from googleapiclient.errors import HttpError
+from src import GoogleApiBackend, GoogleCalendar, InMemoryBackend
+from src.backends import CalendarNotFoundError, EventNotFoundError
+
+
+def _event(summary: str, start: str, end: str) -> dict:
+    return {
+        "summary": summary,
+        "start": {"dateTime": start, "timeZone": "UTC"},
+        "end": {"dateTime": end, "timeZone": "UTC"},
+    }
+
+
+def test_in_memory_backend_lists_overlapping_events_in_order():
+    backend = InMemoryBackend()
+    for summary, start, end in [
+        ("late", "2024-01-01T15:00:00", "2024-01-01T16:00:00"),
+        ("early", "2024-01-01T09:00:00", "2024-01-01T10:00:00"),
+        ("long", "2023-12-31T20:00:00", "2024-01-01T09:30:00"),
+        ("before", "2023-12-31T08:00:00", "2023-12-31T09:00:00"),
+    ]:
+        backend.insert_event("primary", _event(summary, start, end))
+
+    result = backend.list_events(
+        "primary", "2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"
+    )
+
+    assert [e["summary"] for e in result["items"]] == ["long", "early", "late"]
+    assert "nextPageToken" not in result
+
+
+def test_in_memory_backend_pages_with_next_page_token():
+    backend = InMemoryBackend()
+    for hour in range(5):
+        backend.insert_event(
+            "primary",
+            _event(
+                f"e{hour}", f"2024-01-01T0{hour}:00:00", f"2024-01-01T0{hour}:30:00"
+            ),
+        )
+
+    summaries = []
+    page_token = None
+    pages = 0
+    while True:
+        result = backend.list_events(
+            "primary",
+            "2024-01-01T00:00:00Z",
+            "2024-01-02T00:00:00Z",
+            page_token=page_token,
+            max_results=2,
+        )
+        pages += 1
+        summaries += [e["summary"] for e in result["items"]]
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            break
+
+    assert pages == 3
+    assert summaries == ["e0", "e1", "e2", "e3", "e4"]
+
+
+def test_in_memory_backend_patch_and_delete():
+    backend = InMemoryBackend()
+    created = backend.insert_event(
+        "primary", _event("standup", "2024-01-01T09:00:00", "2024-01-01T09:15:00")
+    )
+
+    patched = backend.patch_event(
+        "primary",
+        created["id"],
+        {
+            "start": {"dateTime": "2024-01-01T10:00:00"},
+            "end": {"dateTime": "2024-01-01T10:15:00"},
+        },
+    )
+    assert patched["summary"] == "standup"
+    assert patched["start"] == {"dateTime": "2024-01-01T10:00:00", "timeZone": "UTC"}
+
+    result = backend.list_events(
+        "primary", "2024-01-01T09:30:00Z", "2024-01-01T11:00:00Z"
+    )
+    assert [e["id"] for e in result["items"]] == [created["id"]]
+
+    backend.delete_event("primary", created["id"])
+    with pytest.raises(EventNotFoundError):
+        backend.get_event("primary", created["id"])
+
+
+def test_google_calendar_with_in_memory_backend():
+    calendar_tool = GoogleCalendar(
+        config_path="tests/data/tools.yaml", backend=InMemoryBackend()
+    )
+
+    event_id = calendar_tool.create_event(
+        summary="Test Event",
+        start_time="2023-12-28T09:00:00",
+        end_time="2023-12-28T10:00:00",
+    )
+    updated = calendar_tool.update_event(event_id, summary="Renamed Event")
+    events = calendar_tool.get_events("2023-12-28", "2023-12-29")
+
+    assert updated["summary"] == "Renamed Event"
+    assert [e["id"] for e in events] == [event_id]
+    assert calendar_tool.credentials is None
+
+
+def test_in_memory_backend_rejects_invalid_times_without_losing_events():
+    backend = InMemoryBackend()
+    created = backend.insert_event(
+        "primary", _event("standup", "2024-01-01T09:00:00", "2024-01-01T09:15:00")
+    )
+
+    with pytest.raises(ValueError):
+        backend.patch_event("primary", created["id"], {"start": {"dateTime": "soon"}})
+    with pytest.raises(ValueError):
+        backend.insert_event("primary", {"summary": "no times"})
+
+    assert backend.get_event("primary", created["id"]) == created
+    result = backend.list_events(
+        "primary", "2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"
+    )
+    assert [e["id"] for e in result["items"]] == [created["id"]]
+
+
+def test_in_memory_backend_does_not_create_calendars_on_access():
+    backend = InMemoryBackend()
+
+    with pytest.raises(CalendarNotFoundError):
+        backend.get_event("nosuch@example.com", "abc")
+    with pytest.raises(CalendarNotFoundError):
+        backend.list_events(
+            "nosuch@example.com", "2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"
+        )
+    with pytest.raises(CalendarNotFoundError):
+        backend.insert_event(
+            "nosuch@example.com",
+            _event("standup", "2024-01-01T09:00:00", "2024-01-01T09:15:00"),
+        )
+
+    calendars = backend.list_calendars()["items"]
+    assert [c["id"] for c in calendars] == ["primary"]
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_google_api_backend_raises_event_not_found(status: int):
+    service = MagicMock()
+    service.events().get().execute.side_effect = HttpError(
+        MagicMock(status=status), b""
+    )
+    backend = GoogleApiBackend(service)
+
+    with pytest.raises(EventNotFoundError):
+        backend.get_event("primary", "abc")
+
+
+def test_google_api_backend_forks_with_its_own_service():
+    services = []
+
+    def build_service():
+        services.append(MagicMock())
+        return services[-1]
+
+    backend = GoogleApiBackend(build_service(), service_factory=build_service)
+    fork = backend.fork()
+
+    assert fork is not None
+    assert fork.service is services[1] is not backend.service
+    assert GoogleApiBackend(MagicMock()).fork() is None
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+from src import GoogleCalendar, InMemoryBackend
+from src.encoding import ResultEncoder
+
+
+def _event(event_id: str, hour: int) -> dict:
+    return {
+        "kind": "calendar#event",
+        "id": event_id,
+        "status": "confirmed",
+        "htmlLink": f"https://www.google.com/calendar/event?eid={event_id}",
+        "iCalUID": f"{event_id}@google.com",
+        "summary": f"Meeting {hour}",
+        "creator": {"email": "me@example.com", "self": True},
+        "organizer": {"email": "me@example.com", "self": True},
+        "start": {"dateTime": f"2024-01-01T{hour:02d}:00:00Z", "timeZone": "UTC"},
+        "end": {"dateTime": f"2024-01-01T{hour:02d}:30:00Z", "timeZone": "UTC"},
+        "attendees": [
+            {"email": "me@example.com", "responseStatus": "accepted"},
+            {"email": "alice@example.com", "displayName": "Alice"},
+        ],
+        "reminders": {"useDefault": True},
+    }
+
+
+def test_encode_events_projects_and_dedupes_people():
+    events = [_event("a", 9), _event("b", 10)]
+
+    encoded = json.loads(ResultEncoder().encode(events))
+
+    assert encoded["people"] == {
+        "p1": "me@example.com",
+        "p2": "Alice <alice@example.com>",
+    }
+    assert encoded["events"][0] == {
+        "id": "a",
+        "summary": "Meeting 9",
+        "start": "2024-01-01T09:00:00Z",
+        "end": "2024-01-01T09:30:00Z",
+        "organizer": "p1",
+        "attendees": ["p1", "p2"],
+    }
+    assert "cursor" not in encoded
+
+
+def test_encode_events_truncates_to_budget():
+    events = [_event(str(i), i) for i in range(10)]
+    encoder = ResultEncoder(max_chars=400)
+
+    encoded = encoder.encode(events)
+    page = json.loads(encoded)
+
+    assert len(encoded) <= 400
+    assert 0 < len(page["events"]) < 10
+    assert page["truncated"] is True
+
+
+def test_oversized_event_is_clipped_to_budget():
+    event = _event("a", 9)
+    event["description"] = "x" * 20_000
+    event["attendees"] = [{"email": f"guest{i}@example.com"} for i in range(200)] + [
+        {"email": "me@example.com"}
+    ]
+    encoder = ResultEncoder(max_tokens=100)
+
+    listed = encoder.encode([event])
+    single = encoder.encode(event)
+
+    assert len(listed) <= 400
+    assert len(single) <= 400
+    page = json.loads(listed)
+    assert page["events"][0]["description"].endswith("[truncated]")
+    assert page["events"][0]["attendeesOmitted"] > 0
+    referenced = {page["events"][0]["organizer"], *page["events"][0]["attendees"]}
+    assert set(page["people"]) == referenced
+    assert json.loads(single)["id"] == "a"
+
+
+def _calendar_tool(backend: InMemoryBackend, **kwargs) -> GoogleCalendar:
+    for i in range(10):
+        backend.insert_event("primary", _event(f"e{i}", i + 8))
+    return GoogleCalendar(
+        config_path="tests/data/tools.yaml", backend=backend, **kwargs
+    )
+
+
+def test_call_function_continues_from_cursor_across_pages(recording_backend):
+    backend = recording_backend(page_size=4)
+    calendar_tool = _calendar_tool(
+        backend, result_encoder=ResultEncoder(max_tokens=100)
+    )
+    arguments = {"time_min": "2024-01-01", "time_max": "2024-01-02"}
+
+    ids = []
+    calls = 0
+    while True:
+        calls += 1
+        encoded = calendar_tool.call_function("get_events", arguments)
+        assert len(encoded) <= 400
+        page = json.loads(encoded)
+        ids += [event["id"] for event in page["events"]]
+        if "cursor" not in page:
+            break
+        arguments["cursor"] = page["cursor"]
+
+    assert ids == [f"e{i}" for i in range(10)]
+    # Each call reads a single backend page.
+    assert backend.calls.count("list_events") == calls
+    assert "call_function" not in [
+        function["function"]["name"] for function in calendar_tool.functions
+    ]
+
+
+def test_get_events_follows_every_page(recording_backend):
+    calendar_tool = _calendar_tool(recording_backend(page_size=4))
+
+    events = calendar_tool.get_events("2024-01-01", "2024-01-02")
+
+    assert [event["id"] for event in events] == [f"e{i}" for i in range(10)]
+
+
+def test_cursor_is_bound_to_its_query(recording_backend):
+    calendar_tool = _calendar_tool(
+        recording_backend(page_size=4), result_encoder=ResultEncoder(max_tokens=100)
+    )
+    page = json.loads(
+        calendar_tool.call_function(
+            "get_events", {"time_min": "2024-01-01", "time_max": "2024-01-02"}
+        )
+    )
+
+    with pytest.raises(ValueError):
+        calendar_tool.call_function(
+            "get_events",
+            {
+                "time_min": "2024-01-01",
+                "time_max": "2024-01-03",
+                "cursor": page["cursor"],
+            },
+        )
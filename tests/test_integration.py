@@ -1,4 +1,3 @@
-import json
 import pytest
 import os
 from src import GoogleCalendar
@@ -26,12 +25,6 @@ def test_integration_openai_function_call():
         },
     ]
 
-    available_functions = {
-        func: getattr(calendar_tool, func)
-        for func in dir(GoogleCalendar)
-        if callable(getattr(GoogleCalendar, func)) and not func.startswith("__")
-    }
-
     client = openai.Client()
     max_cycles = 5
 
@@ -50,11 +43,11 @@ def test_integration_openai_function_call():
         if response_message.tool_calls:
             function_call = response_message.tool_calls[0]
             function_name = function_call.function.name
-            function_to_call = available_functions[function_name]
-            function_args = json.loads(function_call.function.arguments)
 
             # Call the function
-            result = function_to_call(**function_args)
+            result = calendar_tool.call_function(
+                function_name, function_call.function.arguments
+            )
 
             # Append the function call result to the messages
             messages.append(
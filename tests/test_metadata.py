@@ -0,0 +1,146 @@
+import time
+
+import pytest
+from src import GoogleCalendar, InMemoryBackend
+from src.metadata import CalendarMetadataCache
+
+
+def _fail(*args, **kwargs):
+    raise RuntimeError("boom")
+
+
+def test_cache_loads_calendar_list_once(recording_backend):
+    backend = recording_backend(time_zone="Europe/Paris")
+    backend.add_calendar(
+        "team@example.com", time_zone="Asia/Seoul", access_role="reader"
+    )
+    cache = CalendarMetadataCache(backend)
+
+    assert cache.time_zone("primary") == "Europe/Paris"
+    assert cache.time_zone("team@example.com") == "Asia/Seoul"
+    assert cache.access_role("team@example.com") == "reader"
+    assert cache.get("unknown@example.com") is None
+    assert backend.calls == ["list_calendars"]
+
+
+def test_cache_resolves_unlisted_calendar_once(recording_backend):
+    backend = recording_backend()
+    backend.add_calendar("shared@example.com", time_zone="Asia/Seoul", listed=False)
+    cache = CalendarMetadataCache(backend)
+
+    assert cache.get("shared@example.com") is None
+    assert cache.time_zone("shared@example.com") == "Asia/Seoul"
+    assert cache.time_zone("shared@example.com") == "Asia/Seoul"
+    assert cache.time_zone("unknown@example.com") is None
+    assert cache.time_zone("unknown@example.com") is None
+    assert backend.calls == ["list_calendars", "get_calendar", "get_calendar"]
+
+
+def test_cache_refreshes_in_background_after_ttl(recording_backend):
+    backend = recording_backend()
+    cache = CalendarMetadataCache(backend, ttl=0.05)
+    assert cache.time_zone("primary") == "UTC"
+
+    backend.add_calendar("primary", time_zone="Asia/Seoul")
+    time.sleep(0.1)
+
+    # The stale entry is served while the refresh runs.
+    assert cache.time_zone("primary") == "UTC"
+    for _ in range(50):
+        if cache.time_zone("primary") == "Asia/Seoul":
+            break
+        time.sleep(0.01)
+    assert cache.time_zone("primary") == "Asia/Seoul"
+
+
+def test_failed_background_refresh_keeps_entries_and_backs_off(
+    recording_backend, caplog
+):
+    backend = recording_backend(time_zone="Asia/Seoul")
+    forks = []
+
+    def fork():
+        forks.append(recording_backend())
+        forks[-1].list_calendars = lambda page_token=None: (
+            forks[-1]._record("list_calendars"),
+            _fail(),
+        )
+        return forks[-1]
+
+    backend.fork = fork
+    cache = CalendarMetadataCache(backend, ttl=0.2)
+    assert cache.time_zone("primary") == "Asia/Seoul"
+
+    time.sleep(0.25)
+    for _ in range(20):
+        assert cache.time_zone("primary") == "Asia/Seoul"
+    time.sleep(0.05)
+
+    assert len(forks) == 1
+    assert forks[0].calls == ["list_calendars"]
+    assert backend.calls == ["list_calendars"]
+    assert caplog.text.count("Refreshing the calendar list failed") == 1
+
+
+def test_cache_refreshes_in_caller_thread_without_fork(recording_backend):
+    backend = recording_backend()
+    backend.fork = lambda: None
+    cache = CalendarMetadataCache(backend, ttl=0.05)
+    assert cache.time_zone("primary") == "UTC"
+
+    backend.add_calendar("primary", time_zone="Asia/Seoul")
+    time.sleep(0.1)
+
+    assert cache.time_zone("primary") == "Asia/Seoul"
+    assert backend.calls == ["list_calendars"] * 2
+
+
+def test_google_calendar_resolves_calendar_time_zone(recording_backend):
+    backend = recording_backend(time_zone="America/New_York")
+    calendar_tool = GoogleCalendar(config_path="tests/data/tools.yaml", backend=backend)
+
+    event_id = calendar_tool.create_event(
+        summary="Test Event",
+        start_time="2023-12-28T09:00:00",
+        end_time="2023-12-28T10:00:00",
+    )
+    event = calendar_tool.get_event(event_id)
+    same_day = calendar_tool.get_events("2023-12-28T00:00:00", "2023-12-29T00:00:00")
+    next_day_utc = calendar_tool.get_events("2023-12-28T15:00:00Z", "2023-12-29")
+
+    assert event["start"]["timeZone"] == "America/New_York"
+    assert [e["id"] for e in same_day] == [event_id]
+    assert [e["id"] for e in next_day_utc] == []
+    assert backend.calls.count("list_calendars") == 1
+
+
+def test_google_calendar_survives_failed_calendar_list_load(recording_backend, caplog):
+    backend = recording_backend()
+    backend.add_calendar("primary", time_zone="Asia/Seoul", listed=False)
+    backend.list_calendars = _fail
+    calendar_tool = GoogleCalendar(config_path="tests/data/tools.yaml", backend=backend)
+
+    event_id = calendar_tool.create_event(
+        summary="Test Event",
+        start_time="2023-12-28T09:00:00",
+        end_time="2023-12-28T10:00:00",
+    )
+    events = calendar_tool.get_events("2023-12-28", "2023-12-29")
+
+    assert calendar_tool.get_event(event_id)["start"]["timeZone"] == "Asia/Seoul"
+    assert [e["id"] for e in events] == [event_id]
+    assert backend.calls.count("get_calendar") == 1
+    assert caplog.text.count("Loading the calendar list failed") == 1
+
+
+def test_google_calendar_rejects_writes_to_read_only_calendar():
+    backend = InMemoryBackend()
+    backend.add_calendar("primary", access_role="reader")
+    calendar_tool = GoogleCalendar(config_path="tests/data/tools.yaml", backend=backend)
+
+    with pytest.raises(PermissionError):
+        calendar_tool.create_event(
+            summary="Test Event",
+            start_time="2023-12-28T09:00:00",
+            end_time="2023-12-28T10:00:00",
+        )
@@ -169,3 +169,4 @@ def test_inline_credential_init_should_pass(config_path: str):
 
     assert calendar_tool.default_calendar_id == "primary"
     assert calendar_tool.credentials is not None
+    assert calendar_tool.service is calendar_tool.backend.service
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src import GoogleCalendar
+from src.singleflight import SingleFlight
+
+
+def _slow_counter():
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"items": [len(calls)]}
+
+    return calls, fn
+
+
+def test_concurrent_threaded_calls_share_one_call():
+    flights = SingleFlight()
+    calls, fn = _slow_counter()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flights.do("key", fn), range(8)))
+
+    assert len(calls) == 1
+    assert results == [{"items": [1]}] * 8
+    assert results[0] is not results[1]
+
+
+def test_concurrent_asyncio_calls_share_one_call():
+    flights = SingleFlight()
+    calls, fn = _slow_counter()
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("key", fn) for _ in range(8)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert results == [{"items": [1]}] * 8
+
+
+def test_sequential_calls_are_not_shared_without_window():
+    flights = SingleFlight()
+    calls, fn = _slow_counter()
+
+    flights.do("key", fn)
+    flights.do("key", fn)
+
+    assert len(calls) == 2
+
+
+def test_coalesce_window_reuses_recent_result_until_forget():
+    flights = SingleFlight(coalesce_window=60)
+    calls, fn = _slow_counter()
+
+    flights.do("key", fn)
+    flights.do("key", fn)
+    assert len(calls) == 1
+
+    flights.forget()
+    flights.do("key", fn)
+    assert len(calls) == 2
+
+
+def test_cancelled_async_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+    calls, fn = _slow_counter()
+
+    async def main():
+        leader = asyncio.ensure_future(
+            asyncio.wait_for(flights.do_async("key", fn), timeout=0.01)
+        )
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do_async("key", fn))
+        threaded = asyncio.to_thread(flights.do, "key", fn)
+        with pytest.raises(asyncio.TimeoutError):
+            await leader
+        return await asyncio.gather(follower, threaded)
+
+    assert asyncio.run(main()) == [{"items": [1]}] * 2
+    assert len(calls) == 1
+
+    # The flight was cleaned up, so the next call starts afresh.
+    assert flights.do("key", fn) == {"items": [2]}
+    assert asyncio.run(flights.do_async("key", fn)) == {"items": [3]}
+
+
+def test_errors_are_shared_but_not_coalesced():
+    flights = SingleFlight(coalesce_window=60)
+    started = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    def call():
+        with pytest.raises(RuntimeError):
+            flights.do("key", fn)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    call()
+    leader.join()
+    assert len(calls) == 1
+
+    call()
+    assert len(calls) == 2
+
+
+def test_google_calendar_async_reads_share_one_call(recording_backend):
+    backend = recording_backend(delay=0.1)
+    forks = []
+    backend.fork = lambda: forks.append(1) or backend
+    calendar_tool = GoogleCalendar(config_path="tests/data/tools.yaml", backend=backend)
+    event_id = calendar_tool.create_event(
+        summary="Test Event",
+        start_time="2023-12-28T09:00:00",
+        end_time="2023-12-28T10:00:00",
+    )
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                calendar_tool.get_events_async("2023-12-28", "2023-12-29")
+                for _ in range(8)
+            ),
+            *(calendar_tool.get_event_async(event_id) for _ in range(8)),
+        )
+
+    results = asyncio.run(main())
+
+    assert backend.calls.count("list_events") == 1
+    assert backend.calls.count("get_event") == 1
+    assert [[e["id"] for e in events] for events in results[:8]] == [[event_id]] * 8
+    assert [event["id"] for event in results[8:]] == [event_id] * 8
+    # Reads ran on the dedicated workers, each of which forked the backend.
+    reads = [t for c, t in zip(backend.calls, backend.threads) if c != "list_calendars"]
+    assert all(name.startswith("calendar-read") for name in reads)
+    assert len(forks) == 1 + len(set(reads))
+    assert "get_events_async" not in [
+        function["function"]["name"] for function in calendar_tool.functions
+    ]
+
+
+def test_google_calendar_async_reads_use_one_worker_without_fork(recording_backend):
+    backend = recording_backend()
+    backend.fork = lambda: None
+    calendar_tool = GoogleCalendar(config_path="tests/data/tools.yaml", backend=backend)
+
+    asyncio.run(calendar_tool.get_events_async("2023-12-28", "2023-12-29"))
+
+    assert calendar_tool._async_read_executor()._max_workers == 1